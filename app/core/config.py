@@ -16,16 +16,28 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "docflow"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 10
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_COMPRESSORS: str = "zstd,zlib"
     
     # JWT
     SECRET_KEY: str = "your-secret-key-change-in-production-use-env-variable"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # CORS
+    CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:8000"]
+    CORS_ALLOW_METHODS: list = ["GET", "POST"]
+    CORS_ALLOW_HEADERS: list = ["Authorization", "Content-Type", "If-None-Match"]
+    CORS_EXPOSE_HEADERS: list = ["ETag"]
+    
     # File Upload
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     UPLOAD_DIR: str = "uploads"
     ALLOWED_EXTENSIONS: list = [".pdf"]
+    RAW_TEXT_INLINE_LIMIT: int = 1024 * 1024  # 1MB; larger texts go to GridFS
+    PDF_EXTRACT_WORKERS: Optional[int] = None  # Per server process; defaults to the CPU count
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,50 @@
+"""
+HTTP caching helpers for list endpoints.
+"""
+import asyncio
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, status
+
+# Clients may reuse a list response briefly without revalidating
+LIST_CACHE_CONTROL = "private, max-age=5"
+
+
+async def compute_list_etag(collection, query: dict, timestamp_field: str) -> str:
+    """
+    Compute an ETag for a filtered collection listing.
+
+    The tag changes whenever a matching record is added or removed, or the
+    newest value of timestamp_field moves. Both come from bounded reads: a
+    count and a one-record find, each served by an index on the filter and
+    timestamp fields, so revalidation stays cheaper than the listing itself.
+
+    Args:
+        collection: Motor collection to inspect
+        query: Filter used by the listing
+        timestamp_field: Field that advances on every write to a record
+
+    Returns:
+        Quoted ETag value
+    """
+    count_records = collection.count_documents(query) if query else collection.estimated_document_count()
+    newest = collection.find(query, {timestamp_field: 1, "_id": 0}).sort(timestamp_field, -1).limit(1)
+    count, records = await asyncio.gather(count_records, newest.to_list(length=1))
+    latest = records[0].get(timestamp_field) if records else None
+    digest = hashlib.blake2b(f"{count}:{latest}".encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already holds this ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+        )
+    return None
@@ -0,0 +1,35 @@
+"""
+ASGI middleware.
+"""
+from fastapi import status
+from app.core.responses import UTCJSONResponse
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject requests whose declared Content-Length exceeds a limit.
+
+    Runs before FastAPI reads and parses the body, so oversized uploads are
+    refused without being buffered. Bodies without a Content-Length are left
+    to the per-endpoint streaming checks.
+    """
+
+    def __init__(self, app, max_body_size: int, detail: str = "Request body too large"):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.detail = detail
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_body_size:
+                        response = UTCJSONResponse(
+                            {"detail": self.detail},
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,21 @@
+"""
+JSON response classes.
+"""
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class UTCJSONResponse(ORJSONResponse):
+    """
+    orjson response that writes UTC datetimes with a "Z" suffix.
+
+    Matches how response models serialize datetimes, so records read through
+    list endpoints look the same as through detail endpoints.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+        )
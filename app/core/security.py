@@ -1,9 +1,12 @@
 """
 JWT authentication and security utilities.
 """
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
+from cachetools import TTLCache
+import jwt
+from jwt import ExpiredSignatureError, PyJWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -15,6 +18,13 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Signing key and accepted algorithms, resolved once
+_KEY = settings.SECRET_KEY.encode()
+_ALGORITHMS = [settings.ALGORITHM]
+
+# Decoded claims of recently verified tokens, keyed by the raw token
+_claims_cache: TTLCache = TTLCache(maxsize=65_536, ttl=60)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
@@ -26,16 +36,37 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def decode_access_token(token: str) -> dict:
+    """
+    Decode and verify a JWT, reusing the result for recently seen tokens.
+    
+    Raises:
+        PyJWTError: If the token is invalid or expired
+    """
+    payload = _claims_cache.get(token)
+    if payload is not None:
+        # The cache may outlive the token itself
+        exp = payload.get("exp")
+        if exp is None or exp > time.time():
+            return payload
+        del _claims_cache[token]
+        raise ExpiredSignatureError("Signature has expired")
+    
+    payload = jwt.decode(token, _KEY, algorithms=_ALGORITHMS)
+    _claims_cache[token] = payload
+    return payload
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -53,11 +84,11 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     )
     
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-    except JWTError:
+    except PyJWTError:
         raise credentials_exception
     
     # In a real application, fetch user from database here
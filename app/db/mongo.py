@@ -1,7 +1,10 @@
 """
 MongoDB database connection and utilities.
 """
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+from bson import Binary
+from cachetools import TTLCache
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
 from typing import Optional
 from app.core.config import settings
 
@@ -9,14 +12,71 @@ from app.core.config import settings
 client: Optional[AsyncIOMotorClient] = None
 database = None
 
+# Short-lived cache of user records, keyed by username
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
 
 async def connect_to_mongo():
     """Create database connection."""
     global client, database
-    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    client = AsyncIOMotorClient(
+        settings.MONGODB_URL,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+        serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        compressors=settings.MONGODB_COMPRESSORS,
+        uuidRepresentation="standard",
+        tz_aware=True
+    )
     database = client[settings.MONGODB_DB_NAME]
     # Test connection
     await client.admin.command('ping')
+    
+    # Warm up pooled connections before the first request arrives
+    await asyncio.gather(
+        database.documents.find_one({}, {"_id": 1}),
+        database.tasks.find_one({}, {"_id": 1}),
+        database.users.find_one({}, {"_id": 1})
+    )
+
+
+async def create_indexes():
+    """Create the indexes backing the list filters/sorts and the login lookup."""
+    db = get_database()
+    if db is None:
+        return
+    
+    await asyncio.gather(
+        db.documents.create_index([("uploaded_at", -1)]),
+        # Filter field first, then the timestamp, so the list ETag's count
+        # and newest-record reads are covered by the index
+        db.documents.create_index([("document_type", 1), ("uploaded_at", -1)]),
+        db.documents.create_index([("skills_lc", 1), ("document_type", 1), ("uploaded_at", -1)]),
+        db.tasks.create_index([("created_at", -1)]),
+        db.tasks.create_index([("updated_at", -1)]),
+        db.tasks.create_index([("status", 1), ("task_type", 1), ("updated_at", -1)]),
+        db.tasks.create_index([("status", 1), ("updated_at", -1)]),
+        db.tasks.create_index([("task_type", 1), ("updated_at", -1)]),
+        db.users.create_index("username", unique=True)
+    )
+
+
+async def backfill_skills_lc():
+    """Add the lowercased skills list to resumes stored before it existed."""
+    db = get_database()
+    if db is None:
+        return
+    
+    await db.documents.update_many(
+        {
+            "document_type": "resume",
+            "extracted_fields.skills": {"$exists": True},
+            "skills_lc": {"$exists": False}
+        },
+        [{"$set": {"skills_lc": {
+            "$map": {"input": "$extracted_fields.skills", "in": {"$toLower": "$$this"}}
+        }}}]
+    )
 
 
 async def close_mongo_connection():
@@ -31,21 +91,68 @@ def get_database():
     return database
 
 
+async def store_raw_text(text: str) -> dict:
+    """
+    Prepare extracted text for storage on a document.
+    
+    Text is kept as UTF-8 bytes so it is not re-validated as a BSON string.
+    Texts above RAW_TEXT_INLINE_LIMIT are written to GridFS instead, keeping
+    the document itself small.
+    
+    Args:
+        text: Extracted document text
+        
+    Returns:
+        Fields to merge into the document: raw_text or raw_text_id
+    """
+    data = text.encode("utf-8")
+    if len(data) <= settings.RAW_TEXT_INLINE_LIMIT:
+        return {"raw_text": Binary(data)}
+    
+    bucket = AsyncIOMotorGridFSBucket(get_database(), bucket_name="raw_text")
+    file_id = await bucket.upload_from_stream("raw_text", data)
+    return {"raw_text_id": file_id}
+
+
+async def delete_raw_text(fields: dict):
+    """Delete the GridFS file written by store_raw_text, if there is one."""
+    file_id = fields.get("raw_text_id")
+    if file_id is not None:
+        bucket = AsyncIOMotorGridFSBucket(get_database(), bucket_name="raw_text")
+        await bucket.delete(file_id)
+
+
 async def get_user_by_username(username: str) -> Optional[dict]:
     """Get user by username from database."""
+    user = _user_cache.get(username)
+    if user is not None:
+        return user
+    
     db = get_database()
     if db is None:
         return None
     user = await db.users.find_one({"username": username})
+    if user is not None:
+        _user_cache[username] = user
     return user
 
 
+def invalidate_user_cache(username: str) -> None:
+    """Drop a cached user record after it has been modified."""
+    _user_cache.pop(username, None)
+
+
 async def create_default_user():
     """Create a default user for testing if it doesn't exist."""
     db = get_database()
     if db is None:
         return
     
+    # Check first so the bcrypt hash is only paid for on a fresh database
+    existing = await db.users.find_one({"username": "admin"}, {"_id": 1})
+    if existing:
+        return
+    
     from app.core.security import get_password_hash
     
     default_user = {
@@ -54,8 +161,5 @@ async def create_default_user():
         "hashed_password": get_password_hash("admin123"),
         "is_active": True
     }
-    
-    existing = await db.users.find_one({"username": "admin"})
-    if not existing:
-        await db.users.insert_one(default_user)
-
+    await db.users.insert_one(default_user)
+    invalidate_user_cache(default_user["username"])
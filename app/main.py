@@ -1,12 +1,27 @@
 """
 DocFlow Intelligence API - Main application entry point.
 """
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.db.mongo import connect_to_mongo, close_mongo_connection, create_default_user
+from app.core.responses import UTCJSONResponse
+from app.core.middleware import BodySizeLimitMiddleware
+from app.db.mongo import connect_to_mongo, close_mongo_connection, create_default_user, create_indexes, backfill_skills_lc
 from app.routes import auth, documents, tasks
+from app.services.pdf_extractor import shutdown_pdf_pool, warm_pdf_pool
+from app.schemas.invoice import extract_invoice_fields
+from app.schemas.resume import extract_resume_fields
+from app.services.classifier import classify_document
+
+
+async def _warm_extractors():
+    """Run the text pipeline once so first-request costs are paid at startup."""
+    sample = "warmup"
+    classify_document(sample)
+    extract_invoice_fields(sample)
+    extract_resume_fields(sample)
 
 
 @asynccontextmanager
@@ -14,10 +29,17 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     await connect_to_mongo()
-    await create_default_user()
+    await asyncio.gather(
+        create_default_user(),
+        create_indexes(),
+        backfill_skills_lc(),
+        _warm_extractors(),
+        warm_pdf_pool()
+    )
     yield
     # Shutdown
     await close_mongo_connection()
+    shutdown_pdf_pool()
 
 
 # Create FastAPI application
@@ -25,16 +47,27 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Backend API for document processing, classification, and workflow management",
+    default_response_class=UTCJSONResponse,
     lifespan=lifespan
 )
 
+# Refuse oversized uploads before their body is read; the allowance covers
+# multipart framing around the file itself. Added before CORS so that
+# rejections still carry CORS headers.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_size=settings.MAX_UPLOAD_SIZE + 64 * 1024,
+    detail=documents.UPLOAD_TOO_LARGE_DETAIL
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=settings.CORS_ALLOW_METHODS,
+    allow_headers=settings.CORS_ALLOW_HEADERS,
+    expose_headers=settings.CORS_EXPOSE_HEADERS,
 )
 
 # Include routers
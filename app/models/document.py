@@ -1,11 +1,16 @@
 """
 Document data models.
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
 
 
+def _utcnow() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
 class Document(BaseModel):
     """Document model for MongoDB storage."""
     
@@ -13,10 +18,11 @@ class Document(BaseModel):
     filename: str
     file_path: str
     document_type: str  # invoice, resume, legal, unknown
-    raw_text: str
+    raw_text: Optional[bytes] = None  # UTF-8 text, when stored inline
+    raw_text_id: Optional[Any] = None  # GridFS file ID, for large texts
     extracted_fields: Dict[str, Any] = {}
     uploaded_by: str
-    uploaded_at: datetime = Field(default_factory=datetime.utcnow)
+    uploaded_at: datetime = Field(default_factory=_utcnow)
     status: str = "processed"  # processed, failed
     
     class Config:
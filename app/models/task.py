@@ -1,11 +1,16 @@
 """
 Task data models.
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from pydantic import BaseModel, Field
 
 
+def _utcnow() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
 class Task(BaseModel):
     """Task model for MongoDB storage."""
     
@@ -13,8 +18,8 @@ class Task(BaseModel):
     document_id: str
     task_type: str  # verify_invoice, screen_candidate, review_compliance
     status: str = "pending"  # pending, in_progress, completed, failed
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
     assigned_to: Optional[str] = None
     metadata: dict = {}
     
@@ -1,6 +1,7 @@
 """
 Authentication routes.
 """
+import asyncio
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
@@ -11,6 +12,11 @@ from pydantic import BaseModel
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Checked against when the user does not exist, so unknown usernames cost
+# the same bcrypt work as wrong passwords. Precomputed (bcrypt of "_", same
+# cost factor as real hashes) to keep bcrypt off the import path.
+_DUMMY_HASH = "$2b$12$CnKOmHu4U6qVFsNFNl1M2e9lVlvtZvcOj9bRDh.bguNhXJoM.u3de"
+
 
 class Token(BaseModel):
     """Token response model."""
@@ -34,15 +40,14 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     
     # Find user
     user = await db.users.find_one({"username": form_data.username})
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
     
-    # Verify password
-    if not verify_password(form_data.password, user["hashed_password"]):
+    # Verify password off the event loop; bcrypt is slow and CPU-bound
+    password_ok = await asyncio.to_thread(
+        verify_password,
+        form_data.password,
+        user["hashed_password"] if user else _DUMMY_HASH
+    )
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
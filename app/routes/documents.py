@@ -1,21 +1,52 @@
 """
 Document management routes.
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends, Query
+import asyncio
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends, Query, Request
 from typing import Optional, List
 from app.core.security import get_current_user
 from app.core.config import settings
-from app.db.mongo import get_database
+from app.core.http_cache import LIST_CACHE_CONTROL, compute_list_etag, not_modified
+from app.core.responses import UTCJSONResponse
+from app.db.mongo import get_database, store_raw_text, delete_raw_text
 from app.services.pdf_extractor import extract_text_from_pdf, save_uploaded_file
-from app.services.classifier import classify_document
-from app.services.extractor import extract_fields_by_type
-from app.services.workflow import create_task
+from app.services.pipeline import analyze_document
+from app.services.workflow import build_task
 from app.models.document import DocumentResponse
 from bson import ObjectId
-from datetime import datetime
+from bson.errors import InvalidId
+from datetime import datetime, timezone
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
+# Fields never returned by the API; excluded from reads to keep payloads small
+DOCUMENT_PROJECTION = {"raw_text": 0, "raw_text_id": 0, "skills_lc": 0}
+
+# Error detail for oversized uploads, shared with the body size middleware
+UPLOAD_TOO_LARGE_DETAIL = f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE / (1024*1024)}MB"
+
+
+def _to_dict(doc: dict) -> dict:
+    """Map a stored document to the fields of DocumentResponse."""
+    return {
+        "id": str(doc["_id"]),
+        "filename": doc["filename"],
+        "document_type": doc["document_type"],
+        "extracted_fields": doc.get("extracted_fields", {}),
+        "uploaded_by": doc["uploaded_by"],
+        "uploaded_at": doc["uploaded_at"],
+        "status": doc.get("status", "processed")
+    }
+
+
+def _to_response(doc: dict) -> DocumentResponse:
+    """
+    Build a response model from a stored document.
+    
+    Stored documents were validated on write, so validation is skipped.
+    """
+    return DocumentResponse.model_construct(**_to_dict(doc))
+
 
 @router.post("/upload", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
 async def upload_document(
@@ -38,19 +69,15 @@ async def upload_document(
             detail="Only PDF files are allowed"
         )
     
-    # Read file content
-    content = await file.read()
-    
-    # Check file size
-    if len(content) > settings.MAX_UPLOAD_SIZE:
+    # Save file, streaming it to disk with a size check
+    try:
+        file_path = await save_uploaded_file(file, settings.UPLOAD_DIR, settings.MAX_UPLOAD_SIZE)
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE / (1024*1024)}MB"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=UPLOAD_TOO_LARGE_DETAIL
         )
     
-    # Save file
-    file_path = await save_uploaded_file(content, file.filename, settings.UPLOAD_DIR)
-    
     try:
         # Extract text
         raw_text = await extract_text_from_pdf(file_path)
@@ -60,11 +87,8 @@ async def upload_document(
                 detail="Could not extract text from PDF"
             )
         
-        # Classify document
-        document_type = classify_document(raw_text)
-        
-        # Extract fields
-        extracted_fields = await extract_fields_by_type(document_type, raw_text)
+        # Classify document and extract fields
+        document_type, extracted_fields = await analyze_document(raw_text)
         
         # Store in database
         db = get_database()
@@ -74,33 +98,46 @@ async def upload_document(
                 detail="Database connection error"
             )
         
+        # Generate the ID client-side so the task can reference it up front
+        document_id = ObjectId()
         document_data = {
+            "_id": document_id,
             "filename": file.filename,
             "file_path": file_path,
             "document_type": document_type,
-            "raw_text": raw_text,
             "extracted_fields": extracted_fields,
             "uploaded_by": current_user["username"],
-            "uploaded_at": datetime.utcnow(),
+            "uploaded_at": datetime.now(timezone.utc),
             "status": "processed"
         }
+        if document_type == "resume" and "skills" in extracted_fields:
+            # Lowercased copy for indexed exact-match skill filtering
+            document_data["skills_lc"] = [s.lower() for s in extracted_fields["skills"]]
+        
+        raw_text_fields = await store_raw_text(raw_text)
+        document_data.update(raw_text_fields)
         
-        result = await db.documents.insert_one(document_data)
-        document_id = str(result.inserted_id)
+        # Store the document and its workflow task concurrently
+        inserts = [db.documents.insert_one(document_data)]
+        task_data = build_task(str(document_id), document_type)
+        if task_data is not None:
+            inserts.append(db.tasks.insert_one(task_data))
+        results = await asyncio.gather(*inserts, return_exceptions=True)
         
-        # Create workflow task
-        await create_task(document_id, document_type)
+        if isinstance(results[0], BaseException):
+            # Never leave a task or stored text behind for a document that
+            # was not stored
+            cleanup = [delete_raw_text(raw_text_fields)]
+            if len(results) > 1 and not isinstance(results[1], BaseException):
+                cleanup.append(db.tasks.delete_one({"_id": results[1].inserted_id}))
+            await asyncio.gather(*cleanup, return_exceptions=True)
+            raise results[0]
+        for result in results[1:]:
+            if isinstance(result, BaseException):
+                raise result
         
         # Return response
-        return DocumentResponse(
-            id=document_id,
-            filename=document_data["filename"],
-            document_type=document_data["document_type"],
-            extracted_fields=document_data["extracted_fields"],
-            uploaded_by=document_data["uploaded_by"],
-            uploaded_at=document_data["uploaded_at"],
-            status=document_data["status"]
-        )
+        return _to_response(document_data)
     
     except HTTPException:
         raise
@@ -113,6 +150,7 @@ async def upload_document(
 
 @router.get("", response_model=List[DocumentResponse])
 async def get_documents(
+    request: Request,
     type: Optional[str] = Query(None, description="Filter by document type"),
     skill: Optional[str] = Query(None, description="Filter resumes by skill"),
     current_user: dict = Depends(get_current_user)
@@ -136,29 +174,25 @@ async def get_documents(
         query["document_type"] = type
     
     if skill and (not type or type == "resume"):
-        # Search in extracted_fields.skills array
-        query["extracted_fields.skills"] = {"$regex": skill, "$options": "i"}
+        # Exact match against the lowercased skills array (indexed)
+        query["skills_lc"] = skill.lower()
         if not type:
             query["document_type"] = "resume"
     
-    # Fetch documents
-    cursor = db.documents.find(query).sort("uploaded_at", -1)
-    documents = await cursor.to_list(length=100)
-    
-    # Convert to response model
-    result = []
-    for doc in documents:
-        result.append(DocumentResponse(
-            id=str(doc["_id"]),
-            filename=doc["filename"],
-            document_type=doc["document_type"],
-            extracted_fields=doc.get("extracted_fields", {}),
-            uploaded_by=doc["uploaded_by"],
-            uploaded_at=doc["uploaded_at"],
-            status=doc.get("status", "processed")
-        ))
+    # Skip the fetch entirely if the client's copy is still current
+    etag = await compute_list_etag(db.documents, query, "uploaded_at")
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
     
-    return result
+    # Fetch documents, converting each batch as it arrives. Returning the
+    # response directly skips response_model validation; the model still
+    # documents the endpoint.
+    cursor = db.documents.find(query, projection=DOCUMENT_PROJECTION).sort("uploaded_at", -1).limit(100)
+    return UTCJSONResponse(
+        [_to_dict(doc) async for doc in cursor],
+        headers={"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+    )
 
 
 @router.get("/{document_id}", response_model=DocumentResponse)
@@ -167,6 +201,15 @@ async def get_document(
     current_user: dict = Depends(get_current_user)
 ):
     """Get a specific document by ID."""
+    # Reject malformed IDs without a database round-trip
+    try:
+        object_id = ObjectId(document_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid document ID"
+        )
+    
     db = get_database()
     if db is None:
         raise HTTPException(
@@ -174,28 +217,12 @@ async def get_document(
             detail="Database connection error"
         )
     
-    try:
-        doc = await db.documents.find_one({"_id": ObjectId(document_id)})
-        if not doc:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Document not found"
-            )
-        
-        return DocumentResponse(
-            id=str(doc["_id"]),
-            filename=doc["filename"],
-            document_type=doc["document_type"],
-            extracted_fields=doc.get("extracted_fields", {}),
-            uploaded_by=doc["uploaded_by"],
-            uploaded_at=doc["uploaded_at"],
-            status=doc.get("status", "processed")
-        )
-    except HTTPException:
-        raise
-    except Exception:
+    doc = await db.documents.find_one({"_id": object_id}, projection=DOCUMENT_PROJECTION)
+    if not doc:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid document ID"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
         )
+    
+    return _to_response(doc)
 
@@ -1,18 +1,51 @@
 """
 Task management routes.
 """
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from typing import Optional, List
+from app.core.http_cache import LIST_CACHE_CONTROL, compute_list_etag, not_modified
+from app.core.responses import UTCJSONResponse
 from app.core.security import get_current_user
 from app.db.mongo import get_database
 from app.models.task import TaskResponse
 from bson import ObjectId
+from bson.errors import InvalidId
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+# Only the fields returned by the API
+TASK_PROJECTION = {
+    "document_id": 1, "task_type": 1, "status": 1, "created_at": 1,
+    "updated_at": 1, "assigned_to": 1, "metadata": 1
+}
+
+
+def _to_dict(task: dict) -> dict:
+    """Map a stored task to the fields of TaskResponse."""
+    return {
+        "id": str(task["_id"]),
+        "document_id": task["document_id"],
+        "task_type": task["task_type"],
+        "status": task["status"],
+        "created_at": task["created_at"],
+        "updated_at": task["updated_at"],
+        "assigned_to": task.get("assigned_to"),
+        "metadata": task.get("metadata", {})
+    }
+
+
+def _to_response(task: dict) -> TaskResponse:
+    """
+    Build a response model from a stored task.
+    
+    Stored tasks were validated on write, so validation is skipped.
+    """
+    return TaskResponse.model_construct(**_to_dict(task))
+
 
 @router.get("", response_model=List[TaskResponse])
 async def get_tasks(
+    request: Request,
     status: Optional[str] = Query(None, description="Filter by task status"),
     task_type: Optional[str] = Query(None, description="Filter by task type"),
     current_user: dict = Depends(get_current_user)
@@ -37,25 +70,21 @@ async def get_tasks(
     if task_type:
         query["task_type"] = task_type
     
-    # Fetch tasks
-    cursor = db.tasks.find(query).sort("created_at", -1)
-    tasks = await cursor.to_list(length=100)
+    # Skip the fetch entirely if the client's copy is still current;
+    # updated_at moves on every status change
+    etag = await compute_list_etag(db.tasks, query, "updated_at")
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
     
-    # Convert to response model
-    result = []
-    for task in tasks:
-        result.append(TaskResponse(
-            id=str(task["_id"]),
-            document_id=task["document_id"],
-            task_type=task["task_type"],
-            status=task["status"],
-            created_at=task["created_at"],
-            updated_at=task["updated_at"],
-            assigned_to=task.get("assigned_to"),
-            metadata=task.get("metadata", {})
-        ))
-    
-    return result
+    # Fetch tasks, converting each batch as it arrives. Returning the
+    # response directly skips response_model validation; the model still
+    # documents the endpoint.
+    cursor = db.tasks.find(query, projection=TASK_PROJECTION).sort("created_at", -1).limit(100)
+    return UTCJSONResponse(
+        [_to_dict(task) async for task in cursor],
+        headers={"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+    )
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
@@ -64,6 +93,15 @@ async def get_task(
     current_user: dict = Depends(get_current_user)
 ):
     """Get a specific task by ID."""
+    # Reject malformed IDs without a database round-trip
+    try:
+        object_id = ObjectId(task_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid task ID"
+        )
+    
     db = get_database()
     if db is None:
         raise HTTPException(
@@ -71,29 +109,12 @@ async def get_task(
             detail="Database connection error"
         )
     
-    try:
-        task = await db.tasks.find_one({"_id": ObjectId(task_id)})
-        if not task:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Task not found"
-            )
-        
-        return TaskResponse(
-            id=str(task["_id"]),
-            document_id=task["document_id"],
-            task_type=task["task_type"],
-            status=task["status"],
-            created_at=task["created_at"],
-            updated_at=task["updated_at"],
-            assigned_to=task.get("assigned_to"),
-            metadata=task.get("metadata", {})
-        )
-    except HTTPException:
-        raise
-    except Exception:
+    task = await db.tasks.find_one({"_id": object_id}, projection=TASK_PROJECTION)
+    if not task:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid task ID"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
         )
+    
+    return _to_response(task)
 
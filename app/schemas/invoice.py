@@ -1,10 +1,26 @@
 """
 Invoice extraction schema and utilities.
 """
+import re
 from typing import Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+# Patterns compiled once at import time
+_NUM_RE = re.compile(r'\d+\.?\d*')
+_DATE_RES = [
+    re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}'),  # MM/DD/YYYY
+    re.compile(r'\d{4}[/-]\d{1,2}[/-]\d{1,2}'),    # YYYY/MM/DD
+]
+_CURRENCY_RE = re.compile(r'(\$|USD|EUR|GBP|INR)', re.IGNORECASE)
+
+# Keyword groups, each matched with a single alternation over a lowercased line
+_VENDOR_KEYWORDS = ['vendor', 'supplier', 'from', 'bill from', 'company']
+_INVOICE_NO_RE = re.compile(r'invoice no|invoice number|invoice#|inv no')
+_INVOICE_NO_PART_RE = re.compile(r'invoice|inv|no|number')
+_VENDOR_RE = re.compile('|'.join(map(re.escape, _VENDOR_KEYWORDS)))
+_AMOUNT_RE = re.compile(r'total|amount due|grand total|invoice amount')
+
 
 class InvoiceSchema(BaseModel):
     """Schema for invoice field extraction."""
@@ -31,39 +47,38 @@ class InvoiceSchema(BaseModel):
         }
 
 
-def extract_invoice_fields(text: str) -> dict:
+def extract_invoice_fields(text: str, text_lower: Optional[str] = None) -> dict:
     """
     Extract invoice fields from text using rule-based patterns.
     
     Args:
         text: Raw text extracted from PDF
+        text_lower: text.lower(), if the caller already has it
         
     Returns:
         Dictionary with extracted invoice fields
     """
-    text_lower = text.lower()
     lines = text.split('\n')
+    lines_lower = (text_lower if text_lower is not None else text.lower()).split('\n')
     
     extracted = {}
     
-    # Extract invoice number
-    for line in lines:
-        if any(keyword in line.lower() for keyword in ['invoice no', 'invoice number', 'invoice#', 'inv no']):
+    # Single pass over the lines; later matches overwrite earlier ones
+    for idx, (line, line_lower) in enumerate(zip(lines, lines_lower)):
+        # Extract invoice number
+        if _INVOICE_NO_RE.search(line_lower):
             # Try to extract number after keyword
             parts = line.split()
             for i, part in enumerate(parts):
-                if any(kw in part.lower() for kw in ['invoice', 'inv', 'no', 'number']):
+                if _INVOICE_NO_PART_RE.search(part.lower()):
                     if i + 1 < len(parts):
                         extracted['invoice_no'] = parts[i + 1].strip(':#')
                         break
-    
-    # Extract vendor (look for common patterns)
-    vendor_keywords = ['vendor', 'supplier', 'from', 'bill from', 'company']
-    for line in lines[:20]:  # Check first 20 lines
-        line_lower = line.lower()
-        if any(kw in line_lower for kw in vendor_keywords):
+        
+        # Extract vendor (look for common patterns in the first 20 lines)
+        if idx < 20 and _VENDOR_RE.search(line_lower):
             # Extract text after keyword
-            for kw in vendor_keywords:
+            for kw in _VENDOR_KEYWORDS:
                 if kw in line_lower:
                     parts = line.split(kw, 1)
                     if len(parts) > 1:
@@ -71,35 +86,23 @@ def extract_invoice_fields(text: str) -> dict:
                         if vendor and len(vendor) > 2:
                             extracted['vendor'] = vendor
                             break
-    
-    # Extract amounts
-    amount_keywords = ['total', 'amount due', 'grand total', 'invoice amount']
-    for line in lines:
-        line_lower = line.lower()
-        for kw in amount_keywords:
-            if kw in line_lower:
-                # Extract numbers from line
-                import re
-                numbers = re.findall(r'\d+\.?\d*', line)
-                if numbers:
-                    try:
-                        amount = float(numbers[-1])  # Usually the last number is total
-                        if amount > 0:
-                            extracted['amount'] = amount
-                            break
-                    except ValueError:
-                        pass
+        
+        # Extract amounts
+        if _AMOUNT_RE.search(line_lower):
+            # Extract numbers from line
+            numbers = _NUM_RE.findall(line)
+            if numbers:
+                try:
+                    amount = float(numbers[-1])  # Usually the last number is total
+                    if amount > 0:
+                        extracted['amount'] = amount
+                except ValueError:
+                    pass
     
     # Extract dates
-    import re
-    date_patterns = [
-        r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',  # MM/DD/YYYY
-        r'\d{4}[/-]\d{1,2}[/-]\d{1,2}',    # YYYY/MM/DD
-    ]
-    
     dates = []
-    for pattern in date_patterns:
-        dates.extend(re.findall(pattern, text))
+    for date_re in _DATE_RES:
+        dates.extend(date_re.findall(text))
     
     if dates:
         extracted['date'] = dates[0]
@@ -107,8 +110,7 @@ def extract_invoice_fields(text: str) -> dict:
             extracted['due_date'] = dates[1]
     
     # Extract currency
-    currency_pattern = r'(\$|USD|EUR|GBP|INR)'
-    currency_match = re.search(currency_pattern, text, re.IGNORECASE)
+    currency_match = _CURRENCY_RE.search(text)
     if currency_match:
         extracted['currency'] = currency_match.group(1).upper()
     
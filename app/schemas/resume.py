@@ -1,9 +1,36 @@
 """
 Resume extraction schema and utilities.
 """
+import re
 from typing import Optional, List
 from pydantic import BaseModel, Field
 
+# Patterns compiled once at import time
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RES = [
+    re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # US format
+    re.compile(r'\d{10}'),  # 10 digits
+]
+_YEAR_RE = re.compile(r'(\d+\.?\d*)\s*(years?|yrs?\.?)')
+
+# Keyword groups, each matched with a single alternation over a lowercased line
+_EXPERIENCE_RE = re.compile(r'experience|years|yrs|yr')
+_EDUCATION_RE = re.compile(r'bachelor|master|phd|degree|education')
+_ROLE_RE = re.compile(r'engineer|developer|manager|analyst|architect|lead')
+
+# Common tech skills, matched as whole words in a single pass. Longer names
+# come first in the alternation so e.g. "javascript" wins over "java".
+_COMMON_SKILLS = frozenset([
+    'python', 'java', 'javascript', 'typescript', 'react', 'node.js',
+    'fastapi', 'django', 'flask', 'mongodb', 'postgresql', 'mysql',
+    'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'git', 'linux',
+    'redis', 'elasticsearch', 'kafka', 'rabbitmq', 'graphql', 'rest api'
+])
+_SKILLS_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, sorted(_COMMON_SKILLS, key=len, reverse=True))) + r')\b',
+    re.IGNORECASE
+)
+
 
 class ResumeSchema(BaseModel):
     """Schema for resume field extraction."""
@@ -30,18 +57,19 @@ class ResumeSchema(BaseModel):
         }
 
 
-def extract_resume_fields(text: str) -> dict:
+def extract_resume_fields(text: str, text_lower: Optional[str] = None) -> dict:
     """
     Extract resume fields from text using rule-based patterns.
     
     Args:
         text: Raw text extracted from PDF
+        text_lower: text.lower(), if the caller already has it
         
     Returns:
         Dictionary with extracted resume fields
     """
-    text_lower = text.lower()
     lines = text.split('\n')
+    lines_lower = (text_lower if text_lower is not None else text.lower()).split('\n')
     
     extracted = {}
     
@@ -52,91 +80,56 @@ def extract_resume_fields(text: str) -> dict:
             extracted['name'] = first_line
     
     # Extract email
-    import re
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, text)
+    email_match = _EMAIL_RE.search(text)
     if email_match:
         extracted['email'] = email_match.group(0)
     
     # Extract phone
-    phone_patterns = [
-        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US format
-        r'\d{10}',  # 10 digits
-    ]
-    for pattern in phone_patterns:
-        phone_match = re.search(pattern, text)
+    for phone_re in _PHONE_RES:
+        phone_match = phone_re.search(text)
         if phone_match:
             extracted['phone'] = phone_match.group(0)
             break
     
-    # Extract skills (common tech skills)
-    common_skills = [
-        'python', 'java', 'javascript', 'typescript', 'react', 'node.js',
-        'fastapi', 'django', 'flask', 'mongodb', 'postgresql', 'mysql',
-        'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'git', 'linux',
-        'redis', 'elasticsearch', 'kafka', 'rabbitmq', 'graphql', 'rest api'
-    ]
-    
-    found_skills = []
-    for skill in common_skills:
-        if skill in text_lower:
-            found_skills.append(skill.title())
-    
-    # Also look for skills section
-    skills_section = False
-    for i, line in enumerate(lines):
-        if 'skills' in line.lower() and len(line.split()) <= 3:
-            skills_section = True
-            # Extract next few lines
-            for j in range(i + 1, min(i + 10, len(lines))):
-                line_lower = lines[j].lower()
-                for skill in common_skills:
-                    if skill in line_lower and skill.title() not in found_skills:
-                        found_skills.append(skill.title())
-            break
+    # Extract skills (common tech skills); a skills section is part of the
+    # text, so a single scan of the whole text covers it as well
+    found_skills = sorted({match.group(1).title() for match in _SKILLS_RE.finditer(text)})
     
     if found_skills:
         extracted['skills'] = found_skills
     
-    # Extract experience years
-    experience_keywords = ['experience', 'years', 'yrs', 'yr']
-    for line in lines:
-        line_lower = line.lower()
-        if any(kw in line_lower for kw in experience_keywords):
+    # Extract experience years, education and current role in one pass
+    experience_done = education_done = role_done = False
+    for idx, (line, line_lower) in enumerate(zip(lines, lines_lower)):
+        if not experience_done and _EXPERIENCE_RE.search(line_lower):
             # Look for numbers followed by year/yrs
-            year_pattern = r'(\d+\.?\d*)\s*(years?|yrs?\.?)'
-            year_match = re.search(year_pattern, line_lower)
+            year_match = _YEAR_RE.search(line_lower)
             if year_match:
                 try:
-                    years = float(year_match.group(1))
-                    extracted['experience_years'] = years
-                    break
+                    extracted['experience_years'] = float(year_match.group(1))
+                    experience_done = True
                 except ValueError:
                     pass
-    
-    # Extract education
-    education_keywords = ['bachelor', 'master', 'phd', 'degree', 'education']
-    for line in lines:
-        line_lower = line.lower()
-        if any(kw in line_lower for kw in education_keywords):
+        
+        # Education comes from the first line mentioning it
+        if not education_done and _EDUCATION_RE.search(line_lower):
+            education_done = True
             if 'bachelor' in line_lower:
                 extracted['education'] = "Bachelor's Degree"
             elif 'master' in line_lower:
                 extracted['education'] = "Master's Degree"
             elif 'phd' in line_lower or 'ph.d' in line_lower:
                 extracted['education'] = "PhD"
-            break
-    
-    # Extract current role (look for job titles)
-    role_keywords = ['engineer', 'developer', 'manager', 'analyst', 'architect', 'lead']
-    for line in lines[:30]:  # Check first 30 lines
-        line_lower = line.lower()
-        if any(kw in line_lower for kw in role_keywords):
-            # Extract role title
-            words = line.split()
-            if len(words) <= 5:  # Reasonable title length
+        
+        # Current role (look for job titles in the first 30 lines)
+        if not role_done and idx < 30 and _ROLE_RE.search(line_lower):
+            # Reasonable title length
+            if len(line.split()) <= 5:
                 extracted['current_role'] = line.strip()
-                break
+                role_done = True
+        
+        if experience_done and education_done and (role_done or idx >= 29):
+            break
     
     return extracted
 
@@ -1,56 +1,110 @@
 """
 Document classification service using rule-based approach.
 """
-from typing import Literal
+import hashlib
+import re
+from typing import Literal, Optional
+from cachetools import LRUCache
 
 
 DocumentType = Literal["invoice", "resume", "legal", "unknown"]
 
 
-def classify_document(text: str) -> DocumentType:
+# Invoice keywords
+_INVOICE_KEYWORDS = (
+    'invoice', 'invoice number', 'invoice no', 'bill to', 'ship to',
+    'total amount', 'amount due', 'due date', 'payment terms',
+    'gst', 'tax', 'subtotal', 'grand total', 'vendor', 'supplier'
+)
+
+# Resume keywords
+_RESUME_KEYWORDS = (
+    'resume', 'curriculum vitae', 'cv', 'objective', 'summary',
+    'experience', 'education', 'skills', 'qualifications',
+    'employment history', 'work experience', 'professional experience',
+    'projects', 'certifications', 'references'
+)
+
+# Legal keywords
+_LEGAL_KEYWORDS = (
+    'legal notice', 'legal document', 'court', 'judgment', 'order',
+    'section', 'subsection', 'act', 'statute', 'regulation',
+    'complaint', 'petition', 'affidavit', 'warrant', 'subpoena',
+    'law', 'legal', 'attorney', 'counsel', 'plaintiff', 'defendant'
+)
+
+# Keywords per document type; on equal scores the earlier type wins
+_KEYWORDS_BY_TYPE = {
+    'invoice': _INVOICE_KEYWORDS,
+    'resume': _RESUME_KEYWORDS,
+    'legal': _LEGAL_KEYWORDS
+}
+
+# Single words are looked up among the text's tokens through one vocabulary
+# mapping each word to its document type; only multi-word phrases need a
+# substring search. For this handful of phrases, str's native substring
+# search outruns both a regex alternation and an Aho-Corasick automaton.
+_SINGLE_VOCAB = {
+    kw: doc_type
+    for doc_type, keywords in _KEYWORDS_BY_TYPE.items()
+    for kw in keywords if ' ' not in kw
+}
+_PHRASES_BY_TYPE = {
+    doc_type: tuple(kw for kw in keywords if ' ' in kw)
+    for doc_type, keywords in _KEYWORDS_BY_TYPE.items()
+}
+# Tie-break rank of each type; a higher rank wins equal scores
+_TIE_RANK = {doc_type: -i for i, doc_type in enumerate(_KEYWORDS_BY_TYPE)}
+_TOKEN_RE = re.compile(r'[a-z]+')
+
+# Recent results keyed by a digest of the text, so reprocessing the same
+# document skips the keyword scan
+_classification_cache = LRUCache(maxsize=1024)
+
+
+def classify_document(text: str, text_lower: Optional[str] = None) -> DocumentType:
     """
     Classify document type based on keywords and patterns.
     
     Args:
         text: Raw text extracted from PDF
+        text_lower: text.lower(), if the caller already has it
         
     Returns:
         Document type: invoice, resume, legal, or unknown
     """
-    text_lower = text.lower()
-    
-    # Invoice keywords
-    invoice_keywords = [
-        'invoice', 'invoice number', 'invoice no', 'bill to', 'ship to',
-        'total amount', 'amount due', 'due date', 'payment terms',
-        'gst', 'tax', 'subtotal', 'grand total', 'vendor', 'supplier'
-    ]
-    invoice_score = sum(1 for keyword in invoice_keywords if keyword in text_lower)
-    
-    # Resume keywords
-    resume_keywords = [
-        'resume', 'curriculum vitae', 'cv', 'objective', 'summary',
-        'experience', 'education', 'skills', 'qualifications',
-        'employment history', 'work experience', 'professional experience',
-        'projects', 'certifications', 'references'
-    ]
-    resume_score = sum(1 for keyword in resume_keywords if keyword in text_lower)
+    # Blank text (e.g. a scanned PDF without OCR) matches no keyword
+    if not text or text.isspace():
+        return "unknown"
     
-    # Legal keywords
-    legal_keywords = [
-        'legal notice', 'legal document', 'court', 'judgment', 'order',
-        'section', 'subsection', 'act', 'statute', 'regulation',
-        'complaint', 'petition', 'affidavit', 'warrant', 'subpoena',
-        'law', 'legal', 'attorney', 'counsel', 'plaintiff', 'defendant'
-    ]
-    legal_score = sum(1 for keyword in legal_keywords if keyword in text_lower)
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    document_type = _classification_cache.get(key)
+    if document_type is None:
+        if text_lower is None:
+            text_lower = text.lower()
+        document_type = _classification_cache[key] = _score_document(text_lower)
+    return document_type
+
+
+def _score_document(text_lower: str) -> DocumentType:
+    """Classify lowercased text by keyword scores, without caching."""
+    # Score each type by how many of its keywords appear in the text; each
+    # keyword counts once, however often it occurs. Single words must match
+    # a whole token, so e.g. "act" is not found inside "contract".
+    tokens = set(_TOKEN_RE.findall(text_lower))
+    scores = dict.fromkeys(_KEYWORDS_BY_TYPE, 0)
+    for keyword in _SINGLE_VOCAB.keys() & tokens:
+        scores[_SINGLE_VOCAB[keyword]] += 1
     
-    # Determine document type based on highest score
-    scores = {
-        'invoice': invoice_score,
-        'resume': resume_score,
-        'legal': legal_score
-    }
+    # Scan phrases for the leading types first, skipping any type that could
+    # not overtake the leader even if all of its phrases were found
+    for doc_type in sorted(scores, key=scores.get, reverse=True):
+        phrases = _PHRASES_BY_TYPE[doc_type]
+        leader = max(scores, key=lambda t: (scores[t], _TIE_RANK[t]))
+        best_possible = (scores[doc_type] + len(phrases), _TIE_RANK[doc_type])
+        if leader != doc_type and best_possible < (scores[leader], _TIE_RANK[leader]):
+            continue
+        scores[doc_type] += sum(1 for phrase in phrases if phrase in text_lower)
     
     max_score = max(scores.values())
     
@@ -1,33 +1,44 @@
 """
 Structured field extraction service based on document type.
 """
-from typing import Dict, Any
+import re
+from typing import Dict, Any, Optional
 from app.services.classifier import DocumentType
 from app.schemas.invoice import extract_invoice_fields
 from app.schemas.resume import extract_resume_fields
 
+_DIGIT_RE = re.compile(r'\d')
 
-async def extract_fields_by_type(document_type: DocumentType, text: str) -> Dict[str, Any]:
+
+async def extract_fields_by_type(
+    document_type: DocumentType,
+    text: str,
+    text_lower: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Extract structured fields based on document type.
     
     Args:
         document_type: Type of document (invoice, resume, legal, unknown)
         text: Raw text extracted from PDF
+        text_lower: text.lower(), if the caller already has it
         
     Returns:
         Dictionary with extracted fields
     """
     if document_type == "invoice":
-        return extract_invoice_fields(text)
+        return extract_invoice_fields(text, text_lower)
     elif document_type == "resume":
-        return extract_resume_fields(text)
+        return extract_resume_fields(text, text_lower)
     elif document_type == "legal":
         # Legal documents - extract basic info
+        if text_lower is None:
+            text_lower = text.lower()
         return {
             "document_type": "legal",
-            "has_sections": "section" in text.lower() or "subsection" in text.lower(),
-            "has_dates": any(char.isdigit() for char in text[:500])
+            # "subsection" contains "section", so one search covers both
+            "has_sections": "section" in text_lower,
+            "has_dates": _DIGIT_RE.search(text, 0, 500) is not None
         }
     else:
         # Unknown document type
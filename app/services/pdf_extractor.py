@@ -1,58 +1,172 @@
 """
 PDF text extraction service.
 """
-import pdfplumber
-from typing import Optional
+import aiofiles
+import asyncio
+import fitz  # PyMuPDF
+import multiprocessing
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import UploadFile
+from typing import List, Optional, Tuple
 import os
+from app.core.config import settings
+
+# Size of each read from the upload stream
+_CHUNK_SIZE = 1024 * 1024
+
+# Upload directories already created by this process
+_ensured_dirs = set()
+
+# Pages parsed per pool task; longer documents are split across workers
+_PAGES_PER_TASK = 16
+
+# Worker processes for PDF parsing, created on first use
+_PDF_WORKERS = settings.PDF_EXTRACT_WORKERS or os.cpu_count()
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Get the PDF parsing pool, creating it if needed."""
+    global _pdf_pool
+    if _pdf_pool is None:
+        # Spawned rather than forked: the server process runs driver threads
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=_PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_pool
+
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next extraction starts a fresh one."""
+    global _pdf_pool
+    if _pdf_pool is pool:
+        _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def warm_pdf_pool():
+    """Start every PDF worker process so the first upload skips spawn costs."""
+    loop = asyncio.get_running_loop()
+    pool = _get_pdf_pool()
+    # Concurrent no-ops find no idle worker, so each one starts a process
+    await asyncio.gather(*[
+        loop.run_in_executor(pool, os.getpid) for _ in range(_PDF_WORKERS)
+    ])
+
+
+def shutdown_pdf_pool():
+    """Stop the PDF parsing worker processes."""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(cancel_futures=True)
+        _pdf_pool = None
+
+
+def _extract_pages_sync(file_path: str, start: int, stop: int) -> Tuple[int, List[str]]:
+    """
+    Extract the text of pages [start, stop) (blocking).
+    
+    Returns:
+        Total page count of the document and the texts of the requested pages
+    """
+    with fitz.open(file_path) as pdf:
+        stop = min(stop, pdf.page_count)
+        # get_text() ends each page with a newline; pages are joined with one
+        return pdf.page_count, [pdf[i].get_text().rstrip("\n") for i in range(start, stop)]
+
+
+async def _extract_text_in_pool(pool: ProcessPoolExecutor, file_path: str) -> str:
+    """Extract the text of a PDF on the given pool, page ranges in parallel."""
+    loop = asyncio.get_running_loop()
+    
+    # The first range also reports how many pages remain to be parsed
+    page_count, texts = await loop.run_in_executor(
+        pool, _extract_pages_sync, file_path, 0, _PAGES_PER_TASK
+    )
+    if page_count > _PAGES_PER_TASK:
+        results = await asyncio.gather(*[
+            loop.run_in_executor(pool, _extract_pages_sync, file_path, start, start + _PAGES_PER_TASK)
+            for start in range(_PAGES_PER_TASK, page_count, _PAGES_PER_TASK)
+        ])
+        for _, range_texts in results:
+            texts.extend(range_texts)
+    
+    return "\n".join(text for text in texts if text).strip()
 
 
 async def extract_text_from_pdf(file_path: str) -> Optional[str]:
     """
-    Extract text from PDF file using pdfplumber.
+    Extract text from PDF file using PyMuPDF.
+    
+    Parsing is CPU-bound, so it runs in a pool of worker processes; the
+    event loop stays responsive and concurrent uploads parse on separate
+    cores. Pages are independent, so long documents are split into page
+    ranges that are parsed in parallel and joined in order.
     
     Args:
         file_path: Path to the PDF file
         
     Returns:
         Extracted text as string, or None if extraction fails
+        
+    Raises:
+        BrokenProcessPool: If a worker died twice in a row, e.g. on a PDF
+            that crashes the parser
     """
-    try:
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text.strip()
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-        return None
-
-
-async def save_uploaded_file(file_content: bytes, filename: str, upload_dir: str) -> str:
+    for attempt in range(2):
+        pool = _get_pdf_pool()
+        try:
+            return await _extract_text_in_pool(pool, file_path)
+        except BrokenProcessPool:
+            # A worker died (crash, OOM kill); replace the pool so later
+            # uploads are unaffected, and retry once on the fresh one
+            _discard_pdf_pool(pool)
+            if attempt:
+                raise
+        except Exception as e:
+            print(f"Error extracting text from PDF: {e}")
+            return None
+
+
+async def save_uploaded_file(file: UploadFile, upload_dir: str, max_size: int) -> str:
     """
-    Save uploaded file to disk.
+    Stream an uploaded file to disk in chunks.
     
     Args:
-        file_content: File content as bytes
-        filename: Original filename
+        file: Uploaded file to read from
         upload_dir: Directory to save the file
+        max_size: Maximum allowed file size in bytes
         
     Returns:
         Path to saved file
+        
+    Raises:
+        ValueError: If the file exceeds max_size; nothing is left on disk
     """
     # Create upload directory if it doesn't exist
-    os.makedirs(upload_dir, exist_ok=True)
+    if upload_dir not in _ensured_dirs:
+        os.makedirs(upload_dir, exist_ok=True)
+        _ensured_dirs.add(upload_dir)
     
     # Generate unique filename
-    import uuid
-    file_ext = os.path.splitext(filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
+    file_ext = os.path.splitext(file.filename)[1]
+    unique_filename = f"{secrets.token_hex(16)}{file_ext}"
     file_path = os.path.join(upload_dir, unique_filename)
     
-    # Write file
-    with open(file_path, "wb") as f:
-        f.write(file_content)
+    # Write file, stopping as soon as the size limit is crossed
+    total = 0
+    async with aiofiles.open(file_path, "wb") as f:
+        while chunk := await file.read(_CHUNK_SIZE):
+            total += len(chunk)
+            if total > max_size:
+                break
+            await f.write(chunk)
+    
+    if total > max_size:
+        os.remove(file_path)
+        raise ValueError(f"File exceeds maximum size of {max_size} bytes")
     
     return file_path
-
@@ -0,0 +1,28 @@
+"""
+Document analysis pipeline: classification followed by field extraction.
+"""
+from typing import Any, Dict, Tuple
+from app.services.classifier import DocumentType, classify_document
+from app.services.extractor import extract_fields_by_type
+
+
+async def analyze_document(text: str) -> Tuple[DocumentType, Dict[str, Any]]:
+    """
+    Classify a document and extract its structured fields.
+    
+    The text is lowercased once and shared by every stage.
+    
+    Args:
+        text: Raw text extracted from PDF
+        
+    Returns:
+        Document type and extracted fields
+    """
+    # Blank text cannot match anything, so skip lowercasing and scanning it
+    if not text or text.isspace():
+        return "unknown", await extract_fields_by_type("unknown", text)
+    
+    text_lower = text.lower()
+    document_type = classify_document(text, text_lower)
+    extracted_fields = await extract_fields_by_type(document_type, text, text_lower)
+    return document_type, extracted_fields
@@ -1,81 +1,140 @@
 """
 Workflow task management service.
 """
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
 from app.db.mongo import get_database
 from app.models.task import TaskCreate, Task
 from bson import ObjectId
 
 
-async def create_task(document_id: str, document_type: str) -> Optional[str]:
+# Map document type to task type
+TASK_TYPE_MAPPING = {
+    "invoice": "verify_invoice",
+    "resume": "screen_candidate",
+    "legal": "review_compliance"
+}
+
+# Tasks collection handle, resolved once per database connection
+_tasks_db = None
+_tasks_collection = None
+
+
+def _get_tasks_collection():
+    """Get the tasks collection, or None if the database is not connected."""
+    global _tasks_db, _tasks_collection
+    db = get_database()
+    if db is not _tasks_db:
+        _tasks_db = db
+        _tasks_collection = db.tasks if db is not None else None
+    return _tasks_collection
+
+
+def build_task(document_id: str, document_type: str) -> Optional[dict]:
     """
-    Create a workflow task based on document type.
+    Build a new workflow task record for a document.
     
     Args:
         document_id: ID of the document
         document_type: Type of document (invoice, resume, legal)
         
     Returns:
-        Task ID if created successfully, None otherwise
+        Task data ready for insertion, or None if the type needs no task
     """
-    # Map document type to task type
-    task_type_mapping = {
-        "invoice": "verify_invoice",
-        "resume": "screen_candidate",
-        "legal": "review_compliance"
-    }
-    
-    task_type = task_type_mapping.get(document_type)
+    task_type = TASK_TYPE_MAPPING.get(document_type)
     if not task_type:
         return None
     
-    db = get_database()
-    if db is None:
-        return None
-    
-    # Create task
-    task_data = {
+    # One clock read, so a new task's created_at equals its updated_at
+    now = datetime.now(timezone.utc)
+    return {
         "document_id": document_id,
         "task_type": task_type,
         "status": "pending",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
+        "created_at": now,
+        "updated_at": now,
         "metadata": {}
     }
+
+
+async def create_task(document_id: str, document_type: str) -> Optional[str]:
+    """
+    Create a workflow task based on document type.
     
-    result = await db.tasks.insert_one(task_data)
+    Args:
+        document_id: ID of the document
+        document_type: Type of document (invoice, resume, legal)
+        
+    Returns:
+        Task ID if created successfully, None otherwise
+    """
+    task_data = build_task(document_id, document_type)
+    if task_data is None:
+        return None
+    
+    tasks = _get_tasks_collection()
+    if tasks is None:
+        return None
+    
+    result = await tasks.insert_one(task_data)
     return str(result.inserted_id)
 
 
-async def get_task_by_id(task_id: str) -> Optional[dict]:
-    """Get task by ID."""
-    db = get_database()
-    if db is None:
+async def create_tasks_bulk(documents: List[Tuple[str, str]]) -> List[str]:
+    """
+    Create workflow tasks for a batch of documents in one round trip.
+    
+    For batch importers; no route calls this yet, and the single-file upload
+    route inserts its task next to the document instead.
+    
+    Args:
+        documents: (document_id, document_type) pairs
+        
+    Returns:
+        IDs of the created tasks; types that need no task are skipped
+    """
+    task_data = [
+        task for task in (build_task(document_id, document_type) for document_id, document_type in documents)
+        if task is not None
+    ]
+    if not task_data:
+        return []
+    
+    tasks = _get_tasks_collection()
+    if tasks is None:
+        return []
+    
+    result = await tasks.insert_many(task_data, ordered=False)
+    return [str(task_id) for task_id in result.inserted_ids]
+
+
+async def get_task_by_id(task_id: str, projection: Optional[dict] = None) -> Optional[dict]:
+    """Get task by ID, optionally limited to the fields in projection."""
+    if not ObjectId.is_valid(task_id):
         return None
     
-    try:
-        task = await db.tasks.find_one({"_id": ObjectId(task_id)})
-        if task:
-            task["id"] = str(task["_id"])
-            del task["_id"]
-        return task
-    except Exception:
+    tasks = _get_tasks_collection()
+    if tasks is None:
         return None
+    
+    task = await tasks.find_one({"_id": ObjectId(task_id)}, projection)
+    if task and "_id" in task:
+        task["id"] = str(task.pop("_id"))
+    return task
 
 
 async def update_task_status(task_id: str, status: str) -> bool:
     """Update task status."""
-    db = get_database()
-    if db is None:
+    if not ObjectId.is_valid(task_id):
         return False
     
-    try:
-        result = await db.tasks.update_one(
-            {"_id": ObjectId(task_id)},
-            {"$set": {"status": status, "updated_at": datetime.utcnow()}}
-        )
-        return result.modified_count > 0
-    except Exception:
+    tasks = _get_tasks_collection()
+    if tasks is None:
         return False
+    
+    result = await tasks.update_one(
+        {"_id": ObjectId(task_id)},
+        {"$set": {"status": status, "updated_at": datetime.now(timezone.utc)}}
+    )
+    return result.modified_count > 0
 